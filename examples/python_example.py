@@ -3,9 +3,66 @@
 
 import sys
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
 
 from status_rollup import Status, StatusTree, status_to_string
 
+# Accepted spellings for status updates (matched after lowercasing)
+_STATUS_MAP: Dict[str, Status] = {
+    "green": Status.GREEN,
+    "yellow": Status.YELLOW,
+    "red": Status.RED,
+    "unknown": Status.UNKNOWN,
+}
+
+
+def flush_updates(
+    tree: StatusTree,
+    pending: List[Tuple[str, Status]],
+    last_overall: Optional[Status],
+) -> Optional[Status]:
+    """Apply all queued status updates and recompute the tree once.
+
+    Returns the overall health, which is only printed if it differs from
+    ``last_overall``.
+    """
+    if not pending:
+        return last_overall
+
+    # A bad node name only skips that update, not the rest of the batch
+    for node_name, status in pending:
+        try:
+            tree.set_status(node_name, status)
+            print(f"Updated {node_name} to {status_to_string(status)}")
+        except RuntimeError as e:
+            print(f"Error: {e}")
+    pending.clear()
+
+    tree.compute()
+
+    # Show overall health when it changed
+    overall = tree.get_status("overall_system_health")
+    if overall is not None and overall != last_overall:
+        print(f"Overall System Health: {status_to_string(overall)}")
+    return overall
+
+
+def prompt_line() -> str:
+    """Prompt for and read one line from an interactive terminal."""
+    return input("> ")
+
+
+def read_piped_line() -> str:
+    """Read one line from a non-interactive stdin, raising EOFError at the end.
+
+    Unlike ``input()``, this reads straight from the buffered ``sys.stdin``
+    without prompting or flushing stdout, so piped updates are ingested quickly.
+    """
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line
+
 
 def main() -> int:
     """Run the Python example."""
@@ -38,19 +95,24 @@ def main() -> int:
         "log_server", "metrics_server",
     ]
 
-    for node in leaf_nodes:
-        tree.set_status(node, Status.GREEN)
-
+    tree.set_statuses(dict.fromkeys(leaf_nodes, Status.GREEN))
     tree.compute()
+    last_overall: Optional[Status] = tree.get_status("overall_system_health")
     print("All leaf nodes initialized to green\n")
 
     # Interactive mode
-    print("Enter status updates (format: <node_name> <status>)")
+    print("Enter status updates (format: <node_name> <status> [<node_name> <status> ...])")
+    print("Updates are queued until 'commit', 'print' or 'get' applies them in one compute")
     print("Type 'print' to show tree, 'get <node_name>' to query, 'quit' to exit\n")
 
+    # Prompt only when a user is typing; piped input is read without prompts
+    read_line: Callable[[], str] = prompt_line if sys.stdin.isatty() else read_piped_line
+
+    pending: List[Tuple[str, Status]] = []
+
     while True:
         try:
-            line = input("> ").strip()
+            line = read_line().strip()
             if not line:
                 continue
 
@@ -58,10 +120,16 @@ def main() -> int:
             command = parts[0].lower()
 
             if command == "quit":
+                # Queued updates are applied rather than silently dropped
+                last_overall = flush_updates(tree, pending, last_overall)
                 print("Exiting...")
                 break
 
-            if command == "print":
+            if command == "commit":
+                last_overall = flush_updates(tree, pending, last_overall)
+
+            elif command == "print":
+                last_overall = flush_updates(tree, pending, last_overall)
                 tree.print_statuses()
 
             elif command == "get":
@@ -69,6 +137,7 @@ def main() -> int:
                     print("Usage: get <node_name>")
                     continue
 
+                last_overall = flush_updates(tree, pending, last_overall)
                 node_name = parts[1]
                 status = tree.get_status(node_name)
                 if status is not None:
@@ -77,46 +146,28 @@ def main() -> int:
                     print(f"Error: Node '{node_name}' does not exist")
 
             else:
-                # Assume it's a status update: <node_name> <status>
-                if len(parts) < 2:
-                    print("Invalid command. Use: <node_name> <status>, 'print', "
-                          "'get <node_name>', or 'quit'")
+                # Assume it's one or more status updates: <node_name> <status> ...
+                if len(parts) < 2 or len(parts) % 2 != 0:
+                    print("Invalid command. Use: <node_name> <status> [...], 'commit', "
+                          "'print', 'get <node_name>', or 'quit'")
                     continue
 
-                node_name = parts[0]
-                status_str = parts[1].lower()
-
-                # Parse status
-                status_map = {
-                    "green": Status.GREEN,
-                    "yellow": Status.YELLOW,
-                    "red": Status.RED,
-                    "unknown": Status.UNKNOWN,
-                }
-
-                if status_str not in status_map:
-                    print(f"Invalid status: {status_str}. "
-                          f"Use: green, yellow, red, or unknown")
-                    continue
-
-                status = status_map[status_str]
-
-                # Update status
-                try:
-                    tree.set_status(node_name, status)
-                    tree.compute()
-
-                    # Show overall health
-                    overall = tree.get_status("overall_system_health")
-                    if overall is not None:
-                        print(f"Updated {node_name} to {status_str}")
-                        print(f"Overall System Health: {status_to_string(overall)}")
-                    else:
-                        print(f"Updated {node_name} to {status_str}")
-                except RuntimeError as e:
-                    print(f"Error: {e}")
+                updates = []
+                for node_name, status_str in zip(parts[0::2], parts[1::2]):
+                    status_name = status_str.lower()
+                    status = _STATUS_MAP.get(status_name)
+                    if status is None:
+                        print(f"Invalid status: {status_name}. "
+                              f"Use: green, yellow, red, or unknown")
+                        break
+                    updates.append((node_name, status))
+                else:
+                    pending.extend(updates)
+                    print(f"Queued {len(updates)} update(s), {len(pending)} pending")
 
         except EOFError:
+            # Apply whatever the end of a piped burst left queued
+            last_overall = flush_updates(tree, pending, last_overall)
             print("\nExiting...")
             break
         except KeyboardInterrupt:
@@ -5,7 +5,7 @@
 
 namespace status_rollup {
 
-// Status enumeration with ordering (Green < Yellow < Red)
+// Status enumeration ordered by severity (Green < Yellow < Red < Unknown)
 enum class Status : uint8_t {
     Green = 0,
     Yellow = 1,
@@ -1,9 +1,13 @@
 #pragma once
 
 #include "status.hpp"
+#include <cstdint>
+#include <future>
 #include <memory>
 #include <optional>
 #include <string>
+#include <unordered_map>
+#include <vector>
 
 namespace CGraph {
     class GPipeline;
@@ -14,6 +18,17 @@ namespace status_rollup {
 
 class StatusNode;
 
+// Flattened view of a loaded tree. Nodes are listed in topological order
+// (every node after its dependencies); the dependencies of node i are
+// children[offsets[i]] .. children[offsets[i + 1] - 1].
+struct TreeLayout {
+    std::vector<std::string> names;
+    std::vector<uint32_t> offsets;
+    std::vector<uint32_t> children;
+    std::vector<std::string> rules;         // Empty for imported (leaf) nodes
+    std::vector<std::vector<int>> params;   // Numeric rule parameters
+};
+
 // Main status tree manager - public API
 class StatusTree {
 public:
@@ -29,18 +44,48 @@ public:
     // Load configuration from JSON file
     void load_config(const std::string& config_file);
 
-    // Import status for a leaf node
+    // Import status for a leaf node; setting the status a node already has
+    // leaves the tree untouched
     void set_status(const std::string& node_name, Status status);
 
-    // Compute all derived statuses
+    // Import statuses for many leaf nodes at once; no status is applied if
+    // any node name is unknown
+    void set_statuses(const std::unordered_map<std::string, Status>& statuses);
+
+    // Flag a node so it and its dependents are re-evaluated by the next
+    // compute(); set_status() does this implicitly
+    void mark_dirty(const std::string& node_name);
+
+    // Compute derived statuses, re-evaluating only nodes downstream of
+    // changes made since the previous call
     void compute();
 
+    // Number of nodes queued for re-evaluation by the next compute()
+    size_t dirty_count() const;
+
+    // Run compute() on a background thread; the tree must outlive the
+    // returned future. All StatusTree operations are thread-safe.
+    std::future<void> compute_async();
+
     // Get status of any node
     std::optional<Status> get_status(const std::string& node_name) const;
 
+    // Get the status of many nodes at once (nullopt for unknown names)
+    std::vector<std::optional<Status>> get_statuses(const std::vector<std::string>& node_names) const;
+
     // Print all node statuses with tree structure
     void print_statuses() const;
 
+    // Export the loaded structure in topological order
+    TreeLayout layout() const;
+
+    // Write the loaded structure to a compact binary snapshot
+    void save_binary(const std::string& snapshot_file) const;
+
+    // Load a structure written by save_binary() instead of a JSON config;
+    // skips JSON parsing and dependency resolution entirely
+    void load_binary(const std::string& snapshot_file);
+
 private:
     class Impl;
     std::unique_ptr<Impl> pimpl_;
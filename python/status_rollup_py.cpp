@@ -1,7 +1,12 @@
 // Python bindings for status_rollup library using pybind11
 
+#include <pybind11/numpy.h>
 #include <pybind11/pybind11.h>
 #include <pybind11/stl.h>
+#include <chrono>
+#include <cstdint>
+#include <future>
+#include <memory>
 #include <optional>
 #include <string>
 
@@ -11,6 +16,25 @@
 namespace py = pybind11;
 using namespace status_rollup;
 
+namespace {
+
+// Python-facing wrapper around the future returned by compute_async()
+class ComputeFuture {
+public:
+    explicit ComputeFuture(std::future<void> future) : future_(future.share()) {}
+
+    bool done() const {
+        return future_.wait_for(std::chrono::seconds(0)) == std::future_status::ready;
+    }
+
+    void wait() const { future_.get(); }
+
+private:
+    std::shared_future<void> future_;
+};
+
+} // namespace
+
 PYBIND11_MODULE(_status_rollup, m) {
     m.doc() = "Python bindings for status_rollup - hierarchical status monitoring and rollup";
 
@@ -31,23 +55,109 @@ PYBIND11_MODULE(_status_rollup, m) {
           py::arg("status"),
           "Convert Status enum to string representation");
 
+    // Flattened tree structure
+    py::class_<TreeLayout>(m, "TreeLayout")
+        .def_readonly("names", &TreeLayout::names,
+                      "Node names in topological order")
+        .def_readonly("offsets", &TreeLayout::offsets,
+                      "Dependencies of node i are children[offsets[i]:offsets[i + 1]]")
+        .def_readonly("children", &TreeLayout::children,
+                      "Dependency node indices")
+        .def_readonly("rules", &TreeLayout::rules,
+                      "Rollup rule name per node (empty for imported nodes)")
+        .def_readonly("params", &TreeLayout::params,
+                      "Numeric rule parameters per node");
+
+    // Handle for a compute() running on a background thread
+    py::class_<ComputeFuture>(m, "ComputeFuture")
+        .def("done", &ComputeFuture::done,
+             "Return True once the background compute() has finished")
+        .def("wait", &ComputeFuture::wait,
+             py::call_guard<py::gil_scoped_release>(),
+             "Block until the background compute() finishes, re-raising any error");
+
     // StatusTree class
+    //
+    // StatusTree is internally synchronized, so the GIL is released around
+    // every call that does not touch Python objects. Other Python threads
+    // (e.g. ones ingesting updates) keep running during long operations.
     py::class_<StatusTree>(m, "StatusTree")
         .def(py::init<>(), "Create a new StatusTree")
         .def("load_config", &StatusTree::load_config,
              py::arg("config_file"),
+             py::call_guard<py::gil_scoped_release>(),
              "Load tree configuration from JSON file")
         .def("set_status", &StatusTree::set_status,
              py::arg("node_name"),
              py::arg("status"),
+             py::call_guard<py::gil_scoped_release>(),
              "Set the status of a leaf node")
+        .def("set_statuses", &StatusTree::set_statuses,
+             py::arg("statuses"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Set the status of many leaf nodes from a {node_name: status} dict")
+        .def("mark_dirty", &StatusTree::mark_dirty,
+             py::arg("node_name"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Flag a node so it and its dependents are re-evaluated by the next compute()")
         .def("compute", &StatusTree::compute,
-             "Compute all derived node statuses based on rollup rules")
+             py::call_guard<py::gil_scoped_release>(),
+             "Compute derived node statuses, re-evaluating only nodes affected by changes")
+        .def("dirty_count", &StatusTree::dirty_count,
+             py::call_guard<py::gil_scoped_release>(),
+             "Number of nodes queued for re-evaluation by the next compute()")
+        .def("compute_async",
+             [](StatusTree& tree) { return ComputeFuture(tree.compute_async()); },
+             py::keep_alive<0, 1>(),
+             "Start compute() on a background thread and return a ComputeFuture")
         .def("get_status", &StatusTree::get_status,
              py::arg("node_name"),
+             py::call_guard<py::gil_scoped_release>(),
              "Get the status of any node (returns None if node doesn't exist)")
+        .def("get_statuses", &StatusTree::get_statuses,
+             py::arg("node_names"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Get the statuses of many nodes in one call (None for nodes that don't exist)")
+        .def("get_statuses_np",
+             [](const StatusTree& tree, const std::vector<std::string>& node_names) {
+                 std::vector<std::optional<Status>> statuses;
+                 {
+                     py::gil_scoped_release release;
+                     statuses = tree.get_statuses(node_names);
+                 }
+                 py::array_t<int8_t> result(static_cast<py::ssize_t>(statuses.size()));
+                 auto out = result.mutable_unchecked<1>();
+                 for (py::ssize_t i = 0; i < out.shape(0); ++i) {
+                     const auto& status = statuses[static_cast<size_t>(i)];
+                     out(i) = status ? static_cast<int8_t>(*status) : int8_t{-1};
+                 }
+                 return result;
+             },
+             py::arg("node_names"),
+             "Get the statuses of many nodes as a numpy int8 array (-1 for nodes that don't exist)")
         .def("print_statuses", &StatusTree::print_statuses,
-             "Print hierarchical tree visualization to stdout");
+             py::call_guard<py::gil_scoped_release>(),
+             "Print hierarchical tree visualization to stdout")
+        .def("layout", &StatusTree::layout,
+             py::call_guard<py::gil_scoped_release>(),
+             "Export the loaded tree structure in topological order")
+        .def("save_binary", &StatusTree::save_binary,
+             py::arg("snapshot_file"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Write the loaded tree structure to a binary snapshot file")
+        .def("load_binary", &StatusTree::load_binary,
+             py::arg("snapshot_file"),
+             py::call_guard<py::gil_scoped_release>(),
+             "Load tree structure from a snapshot written by save_binary()")
+        .def_static("from_binary",
+             [](const std::string& snapshot_file) {
+                 auto tree = std::make_unique<StatusTree>();
+                 py::gil_scoped_release release;
+                 tree->load_binary(snapshot_file);
+                 return tree;
+             },
+             py::arg("snapshot_file"),
+             "Create a StatusTree from a snapshot written by save_binary()");
 
     // Add version info
     m.attr("__version__") = "0.1.0";
@@ -1,38 +1,59 @@
 #include "rollup_rule.hpp"
 #include <nlohmann/json.hpp>
+#include <algorithm>
 #include <stdexcept>
+#include <unordered_map>
 
 using json = nlohmann::json;
 
 namespace status_rollup {
 
-// WorstStatusRule implementation
-Status WorstStatusRule::compute(std::span<const Status> inputs) const {
-    if (inputs.empty()) return Status::Unknown;
+namespace {
+
+uint32_t total(const StatusCounts& counts) {
+    return counts[0] + counts[1] + counts[2] + counts[3];
+}
+
+uint32_t count_of(const StatusCounts& counts, Status status) {
+    return counts[static_cast<size_t>(status)];
+}
 
-    Status worst = Status::Green;
-    for (const auto& status : inputs) {
-        if (status > worst) worst = status;
+uint16_t checked_threshold(int value, const char* param_name) {
+    if (value < 0 || value > UINT16_MAX) {
+        throw std::runtime_error(std::string("threshold_rollup parameter ") + param_name +
+                                 " must be between 0 and " + std::to_string(UINT16_MAX));
     }
-    return worst;
+    return static_cast<uint16_t>(value);
+}
+
+} // namespace
+
+StatusCounts count_statuses(std::span<const Status> inputs) {
+    return count_statuses(inputs.begin(), inputs.end(), [](Status status) { return status; });
+}
+
+// WorstStatusRule implementation
+Status WorstStatusRule::evaluate(const StatusCounts& counts) const {
+    // Status ordinals are ordered by severity (Unknown dominating), so the
+    // worst status is the highest non-empty bucket. No inputs yields Unknown.
+    uint32_t worst = total(counts) == 0 ? static_cast<uint32_t>(Status::Unknown) : 0;
+    for (uint32_t s = 1; s < counts.size(); ++s) {
+        worst = std::max(worst, s * (counts[s] != 0));
+    }
+    return static_cast<Status>(worst);
 }
 
 // ThresholdRollupRule implementation
 ThresholdRollupRule::ThresholdRollupRule(int red_threshold, int yellow_to_yellow, int yellow_to_red)
-    : red_threshold_(red_threshold)
-    , yellow_to_yellow_(yellow_to_yellow)
-    , yellow_to_red_(yellow_to_red) {}
+    : red_threshold_(checked_threshold(red_threshold, "red_threshold"))
+    , yellow_to_yellow_(checked_threshold(yellow_to_yellow, "yellow_to_yellow"))
+    , yellow_to_red_(checked_threshold(yellow_to_red, "yellow_to_red")) {}
 
-Status ThresholdRollupRule::compute(std::span<const Status> inputs) const {
-    if (inputs.empty()) return Status::Unknown;
+Status ThresholdRollupRule::evaluate(const StatusCounts& counts) const {
+    if (total(counts) == 0) return Status::Unknown;
 
-    int red_count = 0;
-    int yellow_count = 0;
-
-    for (const auto& status : inputs) {
-        if (status == Status::Red) red_count++;
-        else if (status == Status::Yellow) yellow_count++;
-    }
+    uint32_t red_count = count_of(counts, Status::Red);
+    uint32_t yellow_count = count_of(counts, Status::Yellow);
 
     // Check red threshold
     if (red_count >= red_threshold_) return Status::Red;
@@ -45,21 +66,13 @@ Status ThresholdRollupRule::compute(std::span<const Status> inputs) const {
 }
 
 // MajorityVoteRule implementation
-Status MajorityVoteRule::compute(std::span<const Status> inputs) const {
-    if (inputs.empty()) return Status::Unknown;
-
-    int counts[3] = {0, 0, 0}; // Green, Yellow, Red
+Status MajorityVoteRule::evaluate(const StatusCounts& counts) const {
+    if (total(counts) == 0) return Status::Unknown;
 
-    for (const auto& status : inputs) {
-        if (status != Status::Unknown) {
-            counts[static_cast<int>(status)]++;
-        }
-    }
-
-    // Find majority
-    int max_count = 0;
+    // Find majority among Green, Yellow, Red (Unknown inputs are ignored)
+    uint32_t max_count = 0;
     Status majority = Status::Green;
-    for (int i = 0; i < 3; ++i) {
+    for (size_t i = 0; i < 3; ++i) {
         if (counts[i] > max_count) {
             max_count = counts[i];
             majority = static_cast<Status>(i);
@@ -70,23 +83,68 @@ Status MajorityVoteRule::compute(std::span<const Status> inputs) const {
 }
 
 // RuleFactory implementation
-std::unique_ptr<RollupRule> RuleFactory::create(const std::string& rule_name, const json& params) {
-    if (rule_name == "worst_status") {
-        return std::make_unique<WorstStatusRule>();
+namespace {
+
+using RuleCreator = std::unique_ptr<RollupRule> (*)(const json& params);
+
+struct RuleSpec {
+    RuleCreator create;
+    std::vector<std::string> param_names;  // Same order as RollupRule::params()
+};
+
+// Rule names are resolved once, when a derived node is created; evaluation
+// then goes straight to the bound rule object
+const std::unordered_map<std::string, RuleSpec>& rule_registry() {
+    static const std::unordered_map<std::string, RuleSpec> registry = {
+        {"worst_status", {[](const json&) -> std::unique_ptr<RollupRule> {
+            return std::make_unique<WorstStatusRule>();
+        }, {}}},
+        {"threshold_rollup", {[](const json& params) -> std::unique_ptr<RollupRule> {
+            int red_threshold = params.value("red_threshold", 1);
+            int yellow_to_yellow = params.value("yellow_to_yellow", 1);
+            int yellow_to_red = params.value("yellow_to_red", 2);
+            return std::make_unique<ThresholdRollupRule>(
+                red_threshold, yellow_to_yellow, yellow_to_red
+            );
+        }, {"red_threshold", "yellow_to_yellow", "yellow_to_red"}}},
+        {"majority_vote", {[](const json&) -> std::unique_ptr<RollupRule> {
+            return std::make_unique<MajorityVoteRule>();
+        }, {}}},
+    };
+    return registry;
+}
+
+const RuleSpec& find_rule(const std::string& rule_name) {
+    const auto& registry = rule_registry();
+    auto it = registry.find(rule_name);
+    if (it == registry.end()) {
+        throw std::runtime_error("Unknown rule: " + rule_name);
     }
-    else if (rule_name == "threshold_rollup") {
-        int red_threshold = params.value("red_threshold", 1);
-        int yellow_to_yellow = params.value("yellow_to_yellow", 1);
-        int yellow_to_red = params.value("yellow_to_red", 2);
-        return std::make_unique<ThresholdRollupRule>(
-            red_threshold, yellow_to_yellow, yellow_to_red
-        );
+    return it->second;
+}
+
+} // namespace
+
+std::unique_ptr<RollupRule> RuleFactory::create(const std::string& rule_name, const json& params) {
+    return find_rule(rule_name).create(params);
+}
+
+std::unique_ptr<RollupRule> RuleFactory::create_from_params(const std::string& rule_name,
+                                                            std::span<const int> params) {
+    const RuleSpec& spec = find_rule(rule_name);
+    if (params.size() != spec.param_names.size()) {
+        throw std::runtime_error("Wrong number of parameters for rule: " + rule_name);
     }
-    else if (rule_name == "majority_vote") {
-        return std::make_unique<MajorityVoteRule>();
+
+    json named_params = json::object();
+    for (size_t i = 0; i < params.size(); ++i) {
+        named_params[spec.param_names[i]] = params[i];
     }
+    return spec.create(named_params);
+}
 
-    throw std::runtime_error("Unknown rule: " + rule_name);
+size_t RuleFactory::param_count(const std::string& rule_name) {
+    return find_rule(rule_name).param_names.size();
 }
 
 } // namespace status_rollup
@@ -2,44 +2,98 @@
 
 #include "status_rollup/status.hpp"
 #include <nlohmann/json_fwd.hpp>
+#include <array>
+#include <cstdint>
 #include <memory>
 #include <span>
 #include <string>
+#include <vector>
 
 namespace status_rollup {
 
+// Number of inputs with each status, indexed by Status value
+using StatusCounts = std::array<uint32_t, 4>;
+
+// Build the status histogram of [first, last), where status_of maps each
+// element to its Status.
+//
+// Counting is SWAR: four 16-bit counters live in one uint64_t, so each input
+// costs a shift and an add in a register instead of a read-modify-write of
+// an array slot. The lanes are flushed before any of them can overflow.
+template <typename It, typename Proj>
+StatusCounts count_statuses(It first, It last, Proj status_of) {
+    constexpr unsigned kLaneBits = 16;
+    constexpr uint32_t kLaneMax = (1u << kLaneBits) - 1;
+
+    StatusCounts counts{};
+    uint64_t lanes = 0;
+    uint32_t pending = 0;
+
+    auto flush = [&] {
+        for (size_t i = 0; i < counts.size(); ++i) {
+            counts[i] += static_cast<uint32_t>((lanes >> (kLaneBits * i)) & kLaneMax);
+        }
+        lanes = 0;
+        pending = 0;
+    };
+
+    for (; first != last; ++first) {
+        lanes += uint64_t{1} << (kLaneBits * static_cast<unsigned>(status_of(*first)));
+        if (++pending == kLaneMax) {
+            flush();
+        }
+    }
+    flush();
+    return counts;
+}
+
+// Build the status histogram of a set of inputs
+StatusCounts count_statuses(std::span<const Status> inputs);
+
 // Base class for all rollup rules
+//
+// Rules only depend on how many inputs have each status, never on their
+// order, so the histogram is a canonical key for a rule's result.
 class RollupRule {
 public:
     virtual ~RollupRule() = default;
-    virtual Status compute(std::span<const Status> inputs) const = 0;
+    Status compute(std::span<const Status> inputs) const { return evaluate(count_statuses(inputs)); }
+    virtual Status evaluate(const StatusCounts& counts) const = 0;
     virtual std::string name() const = 0;
+
+    // Numeric parameters, in the order RuleFactory reads them
+    virtual std::vector<int> params() const { return {}; }
 };
 
 // Rule: Take the worst (highest) status
-class WorstStatusRule : public RollupRule {
+class WorstStatusRule final : public RollupRule {
 public:
-    Status compute(std::span<const Status> inputs) const override;
+    Status evaluate(const StatusCounts& counts) const override;
     std::string name() const override { return "worst_status"; }
 };
 
 // Rule: Require threshold number of reds before rolling up to red
-class ThresholdRollupRule : public RollupRule {
+// Thresholds must be in [0, 65535]; they are stored as uint16_t so the whole
+// rule (vptr + parameters) fits in 16 bytes
+class ThresholdRollupRule final : public RollupRule {
 public:
     ThresholdRollupRule(int red_threshold, int yellow_to_yellow, int yellow_to_red);
-    Status compute(std::span<const Status> inputs) const override;
+    Status evaluate(const StatusCounts& counts) const override;
     std::string name() const override { return "threshold_rollup"; }
+    std::vector<int> params() const override {
+        return {red_threshold_, yellow_to_yellow_, yellow_to_red_};
+    }
 
 private:
-    int red_threshold_;
-    int yellow_to_yellow_;
-    int yellow_to_red_;
+    uint16_t red_threshold_;
+    uint16_t yellow_to_yellow_;
+    uint16_t yellow_to_red_;
 };
 
 // Rule: Use majority voting
-class MajorityVoteRule : public RollupRule {
+class MajorityVoteRule final : public RollupRule {
 public:
-    Status compute(std::span<const Status> inputs) const override;
+    Status evaluate(const StatusCounts& counts) const override;
     std::string name() const override { return "majority_vote"; }
 };
 
@@ -47,6 +101,13 @@ public:
 class RuleFactory {
 public:
     static std::unique_ptr<RollupRule> create(const std::string& rule_name, const nlohmann::json& params);
+
+    // Create from positional parameters, as returned by RollupRule::params()
+    static std::unique_ptr<RollupRule> create_from_params(const std::string& rule_name,
+                                                          std::span<const int> params);
+
+    // Number of positional parameters create_from_params() expects for a rule
+    static size_t param_count(const std::string& rule_name);
 };
 
 } // namespace status_rollup
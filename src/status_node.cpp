@@ -2,11 +2,11 @@
 
 namespace status_rollup {
 
-StatusNode::StatusNode() : name_(""), status_(Status::Unknown) {}
+StatusNode::StatusNode() : status_(Status::Unknown), name_("") {}
 
 StatusNode::StatusNode(std::string name)
-    : name_(std::move(name))
-    , status_(Status::Unknown) {}
+    : status_(Status::Unknown)
+    , name_(std::move(name)) {}
 
 void StatusNode::set_name(const std::string& name) {
     name_ = name;
@@ -26,13 +26,10 @@ CStatus StatusNode::run() {
         return CStatus();
     }
 
-    // Derived node - compute from dependencies
-    std::vector<Status> input_statuses;
-    for (auto* dep : dependencies_) {
-        input_statuses.push_back(static_cast<StatusNode*>(dep)->get_status());
-    }
-
-    status_ = rule_->compute(input_statuses);
+    // Derived node - evaluate the rule on the histogram of dependency statuses
+    status_ = rule_->evaluate(count_statuses(
+        dependencies_.begin(), dependencies_.end(),
+        [](const StatusNode* dep) { return dep->get_status(); }));
     return CStatus();
 }
 
@@ -44,6 +41,10 @@ const std::string& StatusNode::get_name() const {
     return name_;
 }
 
+const RollupRule* StatusNode::get_rule() const {
+    return rule_.get();
+}
+
 void StatusNode::add_dependency(StatusNode* dep) {
     dependencies_.push_back(dep);
 }
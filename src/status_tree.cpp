@@ -1,6 +1,7 @@
 #include "status_rollup/status_tree.hpp"
 #include "status_node.hpp"
 #include "rollup_rule.hpp"
+#include "tree_snapshot.hpp"
 
 // Suppress warnings from CGraph headers
 #pragma GCC diagnostic push
@@ -18,8 +19,10 @@
 #include <fstream>
 #include <functional>
 #include <iostream>
+#include <mutex>
 #include <queue>
 #include <stdexcept>
+#include <string>
 #include <unordered_map>
 #include <unordered_set>
 #include <vector>
@@ -36,6 +39,7 @@ public:
     }
 
     void load_config(const std::string& config_file) {
+        std::lock_guard<std::mutex> lock(mutex_);
         std::ifstream file(config_file);
         if (!file) {
             throw std::runtime_error("Cannot open config file: " + config_file);
@@ -50,127 +54,216 @@ public:
             node_configs[node_name] = node_config;
         }
 
-        // First pass: Create all leaf nodes (no dependencies)
+        // Order nodes with Kahn's algorithm: a node becomes ready once all of
+        // its dependencies have been created, and leaf nodes are ready at once
+        std::unordered_map<std::string, size_t> pending_deps;
+        std::unordered_map<std::string, std::vector<std::string>> dependents;
+        std::queue<std::string> ready;
+
         for (const auto& [node_name, node_config] : node_configs) {
             std::string type = node_config.value("type", "imported");
             if (type == "imported") {
-                CGraph::GElementPtr node_ptr = nullptr;
-                pipeline_->registerGElement<StatusNode>(&node_ptr, {}, node_name);
-
-                auto* node = dynamic_cast<StatusNode*>(node_ptr);
-                if (!node) {
-                    throw std::runtime_error("Failed to create node: " + node_name);
-                }
-
-                node->set_name(node_name);
-                leaf_nodes_.push_back(node);
-                nodes_[node_name] = node_ptr;
-            }
-        }
-
-        // Second pass: Create derived nodes (with dependencies)
-        // Keep trying until all nodes are created (handles arbitrary dependency order)
-        std::unordered_set<std::string> created;
-        for (const auto& [name, _] : nodes_) {
-            created.insert(name);
-        }
-
-        bool progress = true;
-        while (progress) {
-            progress = false;
-
-            for (const auto& [node_name, node_config] : node_configs) {
-                if (created.count(node_name)) continue;
-
-                std::string type = node_config.value("type", "imported");
-                if (type != "derived") continue;
-
-                // Check if all dependencies are created
+                ready.push(node_name);
+            } else if (type == "derived") {
                 std::vector<std::string> dep_names = node_config.value("dependencies", std::vector<std::string>{});
-                bool all_deps_ready = true;
+                pending_deps[node_name] = dep_names.size();
                 for (const auto& dep_name : dep_names) {
-                    if (!created.count(dep_name)) {
-                        all_deps_ready = false;
-                        break;
-                    }
+                    dependents[dep_name].push_back(node_name);
                 }
-
-                if (!all_deps_ready) continue;
-
-                // Create node with dependencies
-                CGraph::GElementPtrSet deps;
-                for (const auto& dep_name : dep_names) {
-                    auto it = nodes_.find(dep_name);
-                    if (it != nodes_.end()) {
-                        deps.insert(it->second);
-                    }
+                if (dep_names.empty()) {
+                    ready.push(node_name);
                 }
+            }
+        }
 
-                CGraph::GElementPtr node_ptr = nullptr;
-                pipeline_->registerGElement<StatusNode>(&node_ptr, deps, node_name);
-
-                auto* node = dynamic_cast<StatusNode*>(node_ptr);
-                if (!node) {
-                    throw std::runtime_error("Failed to create node: " + node_name);
+        // Resolve the creation order and build every rule before touching the
+        // tree, so an invalid config leaves it unchanged
+        std::vector<std::string> order;
+        order.reserve(node_configs.size());
+        while (!ready.empty()) {
+            std::string node_name = ready.front();
+            ready.pop();
+            order.push_back(node_name);
+
+            auto it = dependents.find(node_name);
+            if (it != dependents.end()) {
+                for (const auto& dependent : it->second) {
+                    if (--pending_deps[dependent] == 0) {
+                        ready.push(dependent);
+                    }
                 }
+            }
+        }
 
-                node->set_name(node_name);
+        // Check if all nodes can be created
+        if (order.size() != node_configs.size()) {
+            throw std::runtime_error("Failed to create all nodes - possible circular dependency or missing dependency");
+        }
 
+        std::vector<std::unique_ptr<RollupRule>> rules(order.size());
+        for (size_t i = 0; i < order.size(); ++i) {
+            check_unused(order[i]);
+            const json& node_config = node_configs.at(order[i]);
+            if (node_config.value("type", "imported") != "imported") {
                 // Set up rollup rule
                 std::string rule_name = node_config.value("rule", "worst_status");
                 json params = node_config.value("params", json::object());
-                node->set_rule(RuleFactory::create(rule_name, params));
+                rules[i] = RuleFactory::create(rule_name, params);
+            }
+        }
 
-                // Add dependencies to the node's internal tracking
-                for (const auto& dep_name : dep_names) {
-                    auto it = nodes_.find(dep_name);
-                    if (it != nodes_.end()) {
-                        node->add_dependency(dynamic_cast<StatusNode*>(it->second));
-                    }
+        node_ids_.reserve(node_ids_.size() + order.size());
+        topo_order_.reserve(topo_order_.size() + order.size());
+        for (size_t i = 0; i < order.size(); ++i) {
+            std::vector<size_t> dep_ids;
+            if (rules[i]) {
+                for (const auto& dep_name : node_configs.at(order[i]).value("dependencies", std::vector<std::string>{})) {
+                    dep_ids.push_back(node_ids_.at(dep_name));
                 }
+            }
+            create_node(order[i], dep_ids, std::move(rules[i]));
+        }
+    }
+
+    void load_binary(const std::string& snapshot_file) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        std::ifstream file(snapshot_file, std::ios::binary);
+        if (!file) {
+            throw std::runtime_error("Cannot open snapshot file: " + snapshot_file);
+        }
 
-                nodes_[node_name] = node_ptr;
-                created.insert(node_name);
-                progress = true;
+        // The snapshot is already in topological order, so nodes are created
+        // in sequence without any dependency resolution
+        TreeLayout layout = read_snapshot(file);
+
+        // As in load_config(), build every rule before creating any node so a
+        // bad snapshot leaves the tree unchanged
+        std::vector<std::unique_ptr<RollupRule>> rules(layout.names.size());
+        for (size_t i = 0; i < layout.names.size(); ++i) {
+            check_unused(layout.names[i]);
+            if (!layout.rules[i].empty()) {
+                rules[i] = RuleFactory::create_from_params(layout.rules[i], layout.params[i]);
             }
         }
 
-        // Check if all nodes were created
-        if (created.size() != node_configs.size()) {
-            throw std::runtime_error("Failed to create all nodes - possible circular dependency or missing dependency");
+        // Snapshot ids are relative to the snapshot; offset them past any
+        // nodes the tree already holds
+        size_t base = topo_order_.size();
+        node_ids_.reserve(base + layout.names.size());
+        topo_order_.reserve(base + layout.names.size());
+        for (size_t i = 0; i < layout.names.size(); ++i) {
+            std::vector<size_t> dep_ids;
+            for (uint32_t j = layout.offsets[i]; j < layout.offsets[i + 1]; ++j) {
+                dep_ids.push_back(base + layout.children[j]);
+            }
+            create_node(layout.names[i], dep_ids, std::move(rules[i]));
         }
     }
 
+    void save_binary(const std::string& snapshot_file) const {
+        TreeLayout tree_layout = layout();
+        std::ofstream file(snapshot_file, std::ios::binary);
+        if (!file) {
+            throw std::runtime_error("Cannot open snapshot file for writing: " + snapshot_file);
+        }
+        write_snapshot(file, tree_layout);
+    }
+
     void set_status(const std::string& node_name, Status status) {
-        auto it = nodes_.find(node_name);
-        if (it == nodes_.end()) {
-            throw std::runtime_error("Unknown node: " + node_name);
+        std::lock_guard<std::mutex> lock(mutex_);
+        import_status(find_id(node_name), checked_status(status));
+    }
+
+    void set_statuses(const std::unordered_map<std::string, Status>& statuses) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        // Resolve every name and status before touching the tree so a bad
+        // entry leaves it unchanged
+        std::vector<std::pair<size_t, Status>> updates;
+        updates.reserve(statuses.size());
+        for (const auto& [node_name, status] : statuses) {
+            updates.emplace_back(find_id(node_name), checked_status(status));
         }
-        auto* node = dynamic_cast<StatusNode*>(it->second);
-        if (node) {
-            node->set_imported_status(status);
+
+        for (const auto& [id, status] : updates) {
+            import_status(id, status);
         }
     }
 
+    void mark_dirty(const std::string& node_name) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        mark_dirty(find_id(node_name));
+    }
+
     void compute() {
-        if (pipeline_) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        if (dirty_queue_.empty()) {
+            return;
+        }
+
+        // A large dirty frontier (right after load_config() or a bulk update)
+        // is cheaper as one full pass on CGraph's pipeline, which evaluates
+        // independent subtrees concurrently on its thread pool. Small trees
+        // always stay incremental: there a single update dirties a large
+        // share of the nodes, yet dispatching to the pool costs more than
+        // evaluating them inline.
+        if (topo_order_.size() >= kMinFullComputeNodes &&
+            dirty_queue_.size() * kFullComputeDivisor >= topo_order_.size()) {
             pipeline_->process();
+            dirty_queue_ = {};
+            dirty_.assign(dirty_.size(), false);
+            return;
+        }
+
+        // Pop dirty nodes in topological order so every node is evaluated
+        // after its dependencies; dependents are only queued when the status
+        // actually changed, pruning subtrees that cannot be affected.
+        while (!dirty_queue_.empty()) {
+            size_t id = dirty_queue_.top();
+            dirty_queue_.pop();
+            dirty_[id] = false;
+
+            StatusNode* node = topo_order_[id];
+            Status before = node->get_status();
+            node->run();
+            if (node->get_status() != before) {
+                for (size_t parent : parents_[id]) {
+                    enqueue(parent);
+                }
+            }
         }
     }
 
+    size_t dirty_count() const {
+        std::lock_guard<std::mutex> lock(mutex_);
+        return dirty_queue_.size();
+    }
+
     std::optional<Status> get_status(const std::string& node_name) const {
-        auto it = nodes_.find(node_name);
-        if (it == nodes_.end()) {
+        std::lock_guard<std::mutex> lock(mutex_);
+        auto it = node_ids_.find(node_name);
+        if (it == node_ids_.end()) {
             return std::nullopt;
         }
-        auto* node = dynamic_cast<StatusNode*>(it->second);
-        if (node) {
-            return node->get_status();
+        return topo_order_[it->second]->get_status();
+    }
+
+    std::vector<std::optional<Status>> get_statuses(const std::vector<std::string>& node_names) const {
+        std::lock_guard<std::mutex> lock(mutex_);
+        std::vector<std::optional<Status>> result;
+        result.reserve(node_names.size());
+        for (const auto& node_name : node_names) {
+            auto it = node_ids_.find(node_name);
+            if (it == node_ids_.end()) {
+                result.emplace_back(std::nullopt);
+            } else {
+                result.emplace_back(topo_order_[it->second]->get_status());
+            }
         }
-        return std::nullopt;
+        return result;
     }
 
     void print_statuses() const {
+        std::lock_guard<std::mutex> lock(mutex_);
         std::cout << "Status Tree Results:\n";
         std::cout << "====================\n\n";
 
@@ -178,14 +271,11 @@ public:
         std::vector<std::pair<std::string, StatusNode*>> leaf_list;
         std::vector<std::pair<std::string, StatusNode*>> derived_list;
 
-        for (const auto& [name, node_ptr] : nodes_) {
-            auto* node = dynamic_cast<StatusNode*>(node_ptr);
-            if (node) {
-                if (node->get_dependencies().empty()) {
-                    leaf_list.emplace_back(name, node);
-                } else {
-                    derived_list.emplace_back(name, node);
-                }
+        for (auto* node : topo_order_) {
+            if (node->get_dependencies().empty()) {
+                leaf_list.emplace_back(node->get_name(), node);
+            } else {
+                derived_list.emplace_back(node->get_name(), node);
             }
         }
 
@@ -296,10 +386,148 @@ public:
         std::cout << "\n";
     }
 
+    TreeLayout layout() const {
+        std::lock_guard<std::mutex> lock(mutex_);
+        TreeLayout result;
+        result.names.reserve(topo_order_.size());
+        result.offsets.reserve(topo_order_.size() + 1);
+        result.rules.reserve(topo_order_.size());
+        result.params.reserve(topo_order_.size());
+
+        result.offsets.push_back(0);
+        for (auto* node : topo_order_) {
+            result.names.push_back(node->get_name());
+            for (auto* dep : node->get_dependencies()) {
+                result.children.push_back(static_cast<uint32_t>(node_ids_.at(dep->get_name())));
+            }
+            result.offsets.push_back(static_cast<uint32_t>(result.children.size()));
+
+            const RollupRule* rule = node->get_rule();
+            result.rules.push_back(rule ? rule->name() : std::string());
+            result.params.push_back(rule ? rule->params() : std::vector<int>{});
+        }
+        return result;
+    }
+
 private:
-    std::unordered_map<std::string, CGraph::GElementPtr> nodes_;
+    // Register a node whose dependencies have all been created already; a
+    // null rule makes it an imported (leaf) node
+    void create_node(const std::string& node_name, const std::vector<size_t>& dep_ids,
+                     std::unique_ptr<RollupRule> rule) {
+        check_unused(node_name);
+
+        CGraph::GElementPtrSet deps;
+        for (size_t dep_id : dep_ids) {
+            deps.insert(topo_order_[dep_id]);
+        }
+
+        CGraph::GElementPtr node_ptr = nullptr;
+        pipeline_->registerGElement<StatusNode>(&node_ptr, deps, node_name);
+
+        auto* node = dynamic_cast<StatusNode*>(node_ptr);
+        if (!node) {
+            throw std::runtime_error("Failed to create node: " + node_name);
+        }
+
+        node->set_name(node_name);
+
+        if (rule) {
+            node->set_rule(std::move(rule));
+
+            // Add dependencies to the node's internal tracking
+            for (size_t dep_id : dep_ids) {
+                node->add_dependency(topo_order_[dep_id]);
+            }
+        } else {
+            leaf_nodes_.push_back(node);
+        }
+
+        add_to_order(node_name, node, dep_ids);
+    }
+
+    // compute() switches to a full parallel pass once at least
+    // 1/kFullComputeDivisor of all nodes are queued, in trees of at least
+    // kMinFullComputeNodes nodes
+    static constexpr size_t kFullComputeDivisor = 2;
+    static constexpr size_t kMinFullComputeNodes = 64;
+
+    // Append a node to every per-node table at once, so the tables stay
+    // consistent even if a later node of the same load fails. Nothing has
+    // been computed for the new node yet, so it starts dirty.
+    void add_to_order(const std::string& node_name, StatusNode* node,
+                      const std::vector<size_t>& dep_ids) {
+        size_t id = topo_order_.size();
+        node_ids_[node_name] = id;
+        topo_order_.push_back(node);
+        parents_.emplace_back();
+        for (size_t dep_id : dep_ids) {
+            parents_[dep_id].push_back(id);
+        }
+        dirty_.push_back(false);
+        enqueue(id);
+    }
+
+    void check_unused(const std::string& node_name) const {
+        if (node_ids_.count(node_name)) {
+            throw std::runtime_error("Duplicate node: " + node_name);
+        }
+    }
+
+    size_t find_id(const std::string& node_name) const {
+        auto it = node_ids_.find(node_name);
+        if (it == node_ids_.end()) {
+            throw std::runtime_error("Unknown node: " + node_name);
+        }
+        return it->second;
+    }
+
+    void enqueue(size_t id) {
+        if (!dirty_[id]) {
+            dirty_[id] = true;
+            dirty_queue_.push(id);
+        }
+    }
+
+    // Queue a node and its direct dependents for the next compute()
+    void mark_dirty(size_t id) {
+        enqueue(id);
+        for (size_t parent : parents_[id]) {
+            enqueue(parent);
+        }
+    }
+
+    // Rules count statuses into a 4-entry histogram, so values beyond
+    // Unknown (constructible from Python as Status(4)) must never reach them
+    static Status checked_status(Status status) {
+        if (status > Status::Unknown) {
+            throw std::runtime_error("Invalid status value: " +
+                                     std::to_string(static_cast<unsigned>(status)));
+        }
+        return status;
+    }
+
+    // Apply an imported status; re-publishing the current status is a no-op
+    // so it triggers no rollup work
+    void import_status(size_t id, Status status) {
+        if (topo_order_[id]->get_status() == status) return;
+        topo_order_[id]->set_imported_status(status);
+        mark_dirty(id);
+    }
+
     std::vector<StatusNode*> leaf_nodes_;
     CGraph::GPipelinePtr pipeline_;
+
+    // Serializes all public operations so the tree can be shared between
+    // threads (the Python bindings release the GIL around these calls)
+    mutable std::mutex mutex_;
+
+    // Single name table: node name -> id, where the id is the node's
+    // position in topological order and indexes all per-node vectors below
+    std::unordered_map<std::string, size_t> node_ids_;
+    std::vector<StatusNode*> topo_order_;
+    std::vector<std::vector<size_t>> parents_;
+    std::vector<bool> dirty_;
+    std::priority_queue<size_t, std::vector<size_t>, std::greater<size_t>> dirty_queue_;
 };
 
 // StatusTree public interface implementation
@@ -315,16 +543,48 @@ void StatusTree::set_status(const std::string& node_name, Status status) {
     pimpl_->set_status(node_name, status);
 }
 
+void StatusTree::set_statuses(const std::unordered_map<std::string, Status>& statuses) {
+    pimpl_->set_statuses(statuses);
+}
+
+void StatusTree::mark_dirty(const std::string& node_name) {
+    pimpl_->mark_dirty(node_name);
+}
+
 void StatusTree::compute() {
     pimpl_->compute();
 }
 
+size_t StatusTree::dirty_count() const {
+    return pimpl_->dirty_count();
+}
+
+std::future<void> StatusTree::compute_async() {
+    return std::async(std::launch::async, [this] { pimpl_->compute(); });
+}
+
 std::optional<Status> StatusTree::get_status(const std::string& node_name) const {
     return pimpl_->get_status(node_name);
 }
 
+std::vector<std::optional<Status>> StatusTree::get_statuses(const std::vector<std::string>& node_names) const {
+    return pimpl_->get_statuses(node_names);
+}
+
 void StatusTree::print_statuses() const {
     pimpl_->print_statuses();
 }
 
+TreeLayout StatusTree::layout() const {
+    return pimpl_->layout();
+}
+
+void StatusTree::save_binary(const std::string& snapshot_file) const {
+    pimpl_->save_binary(snapshot_file);
+}
+
+void StatusTree::load_binary(const std::string& snapshot_file) {
+    pimpl_->load_binary(snapshot_file);
+}
+
 } // namespace status_rollup
@@ -0,0 +1,237 @@
+#include "tree_snapshot.hpp"
+#include "rollup_rule.hpp"
+#include <array>
+#include <cstdint>
+#include <istream>
+#include <ostream>
+#include <stdexcept>
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+namespace status_rollup {
+
+namespace {
+
+constexpr std::array<char, 4> kMagic = {'S', 'R', 'T', 'B'};
+constexpr uint32_t kVersion = 1;
+constexpr uint32_t kByteOrderMark = 0x01020304;
+
+struct SnapshotHeader {
+    std::array<char, 4> magic;
+    uint32_t version;
+    uint32_t byte_order;
+    uint32_t node_count;
+    uint32_t edge_count;
+    uint32_t param_count;
+    uint32_t string_bytes;
+};
+
+[[noreturn]] void invalid(const std::string& reason) {
+    throw std::runtime_error("Invalid snapshot: " + reason);
+}
+
+uint32_t checked_size(size_t size) {
+    if (size > UINT32_MAX) {
+        throw std::runtime_error("Tree too large for snapshot format");
+    }
+    return static_cast<uint32_t>(size);
+}
+
+template <typename T>
+void write_array(std::ostream& out, const std::vector<T>& values) {
+    out.write(reinterpret_cast<const char*>(values.data()),
+              static_cast<std::streamsize>(values.size() * sizeof(T)));
+}
+
+template <typename T>
+std::vector<T> read_array(std::istream& in, size_t count) {
+    std::vector<T> values(count);
+    in.read(reinterpret_cast<char*>(values.data()),
+            static_cast<std::streamsize>(count * sizeof(T)));
+    if (!in) {
+        invalid("truncated file");
+    }
+    return values;
+}
+
+// Names reach Python as str, so they must be well-formed UTF-8: no
+// overlong forms, surrogates or code points beyond U+10FFFF
+bool is_valid_utf8(const std::string& s) {
+    size_t i = 0;
+    while (i < s.size()) {
+        auto byte = [&](size_t k) { return static_cast<unsigned char>(s[k]); };
+        unsigned char c = byte(i);
+        size_t len;
+        unsigned char lo = 0x80;
+        unsigned char hi = 0xBF;
+        if (c < 0x80) {
+            ++i;
+            continue;
+        } else if (c >= 0xC2 && c <= 0xDF) {
+            len = 2;
+        } else if (c >= 0xE0 && c <= 0xEF) {
+            len = 3;
+            if (c == 0xE0) lo = 0xA0;
+            if (c == 0xED) hi = 0x9F;
+        } else if (c >= 0xF0 && c <= 0xF4) {
+            len = 4;
+            if (c == 0xF0) lo = 0x90;
+            if (c == 0xF4) hi = 0x8F;
+        } else {
+            return false;
+        }
+        if (s.size() - i < len || byte(i + 1) < lo || byte(i + 1) > hi) {
+            return false;
+        }
+        for (size_t k = 2; k < len; ++k) {
+            if ((byte(i + k) & 0xC0) != 0x80) {
+                return false;
+            }
+        }
+        i += len;
+    }
+    return true;
+}
+
+} // namespace
+
+void write_snapshot(std::ostream& out, const TreeLayout& layout) {
+    std::vector<uint32_t> param_offsets = {0};
+    std::vector<int32_t> params;
+    std::vector<uint32_t> string_offsets = {0};
+    std::string strings;
+
+    for (size_t id = 0; id < layout.names.size(); ++id) {
+        params.insert(params.end(), layout.params[id].begin(), layout.params[id].end());
+        param_offsets.push_back(checked_size(params.size()));
+
+        strings += layout.names[id];
+        string_offsets.push_back(checked_size(strings.size()));
+        strings += layout.rules[id];
+        string_offsets.push_back(checked_size(strings.size()));
+    }
+
+    SnapshotHeader header{
+        kMagic,
+        kVersion,
+        kByteOrderMark,
+        checked_size(layout.names.size()),
+        checked_size(layout.children.size()),
+        checked_size(params.size()),
+        checked_size(strings.size()),
+    };
+
+    out.write(reinterpret_cast<const char*>(&header), sizeof(header));
+    write_array(out, layout.offsets);
+    write_array(out, layout.children);
+    write_array(out, param_offsets);
+    write_array(out, params);
+    write_array(out, string_offsets);
+    out.write(strings.data(), static_cast<std::streamsize>(strings.size()));
+
+    if (!out) {
+        throw std::runtime_error("Failed to write snapshot");
+    }
+}
+
+TreeLayout read_snapshot(std::istream& in) {
+    // Bound every allocation by the actual file size before reading sections
+    in.seekg(0, std::ios::end);
+    auto file_size = static_cast<uint64_t>(in.tellg());
+    in.seekg(0, std::ios::beg);
+
+    SnapshotHeader header{};
+    in.read(reinterpret_cast<char*>(&header), sizeof(header));
+    if (!in || header.magic != kMagic) {
+        invalid("not a status tree snapshot");
+    }
+    if (header.byte_order != kByteOrderMark) {
+        invalid("written on a machine with a different byte order");
+    }
+    if (header.version != kVersion) {
+        invalid("unsupported version " + std::to_string(header.version));
+    }
+
+    uint64_t n = header.node_count;
+    uint64_t expected_size = sizeof(header)
+        + 4 * (n + 1)
+        + 4 * uint64_t{header.edge_count}
+        + 4 * (n + 1)
+        + 4 * uint64_t{header.param_count}
+        + 4 * (2 * n + 1)
+        + header.string_bytes;
+    if (expected_size != file_size) {
+        invalid("size does not match header");
+    }
+
+    auto offsets = read_array<uint32_t>(in, n + 1);
+    auto children = read_array<uint32_t>(in, header.edge_count);
+    auto param_offsets = read_array<uint32_t>(in, n + 1);
+    auto params = read_array<int32_t>(in, header.param_count);
+    auto string_offsets = read_array<uint32_t>(in, 2 * n + 1);
+    auto strings = read_array<char>(in, header.string_bytes);
+
+    auto check_offsets = [](const std::vector<uint32_t>& offs, uint64_t end, const char* what) {
+        if (offs.front() != 0 || offs.back() != end) {
+            invalid(std::string("bad ") + what + " offsets");
+        }
+        for (size_t i = 1; i < offs.size(); ++i) {
+            if (offs[i] < offs[i - 1]) {
+                invalid(std::string("bad ") + what + " offsets");
+            }
+        }
+    };
+    check_offsets(offsets, header.edge_count, "dependency");
+    check_offsets(param_offsets, header.param_count, "parameter");
+    check_offsets(string_offsets, header.string_bytes, "string");
+
+    TreeLayout layout;
+    layout.offsets = std::move(offsets);
+    layout.children = std::move(children);
+    layout.names.reserve(n);
+    layout.rules.reserve(n);
+    layout.params.reserve(n);
+
+    std::unordered_set<std::string> seen_names;
+    seen_names.reserve(n);
+    for (size_t id = 0; id < n; ++id) {
+        auto string_at = [&](size_t i) {
+            return std::string(strings.data() + string_offsets[i], string_offsets[i + 1] - string_offsets[i]);
+        };
+        layout.names.push_back(string_at(2 * id));
+        layout.rules.push_back(string_at(2 * id + 1));
+        layout.params.emplace_back(params.begin() + param_offsets[id],
+                                   params.begin() + param_offsets[id + 1]);
+
+        // Checked before any message below embeds the name or rule
+        if (!is_valid_utf8(layout.names.back()) || !is_valid_utf8(layout.rules.back())) {
+            invalid("node " + std::to_string(id) + " has a name or rule that is not valid UTF-8");
+        }
+
+        if (!seen_names.insert(layout.names.back()).second) {
+            invalid("duplicate node " + layout.names.back());
+        }
+
+        // Rules are checked here so loading never fails part-way through
+        const std::string& rule = layout.rules.back();
+        if (rule.empty()) {
+            if (layout.offsets[id] != layout.offsets[id + 1] || !layout.params.back().empty()) {
+                invalid("imported node with dependencies or parameters");
+            }
+        } else if (layout.params.back().size() != RuleFactory::param_count(rule)) {
+            invalid("wrong number of parameters for rule " + rule);
+        }
+
+        // Dependencies must precede their dependents (topological order)
+        for (uint32_t j = layout.offsets[id]; j < layout.offsets[id + 1]; ++j) {
+            if (layout.children[j] >= id) {
+                invalid("nodes are not in topological order");
+            }
+        }
+    }
+
+    return layout;
+}
+
+} // namespace status_rollup
@@ -0,0 +1,23 @@
+#pragma once
+
+#include "status_rollup/status_tree.hpp"
+#include <iosfwd>
+
+namespace status_rollup {
+
+// Binary snapshot of a TreeLayout, so a tree can be reloaded without parsing
+// JSON. All sections are flat arrays written in native byte order:
+//
+//   SnapshotHeader
+//   uint32_t offsets[node_count + 1]
+//   uint32_t children[edge_count]
+//   uint32_t param_offsets[node_count + 1]
+//   int32_t  params[param_count]
+//   uint32_t string_offsets[2 * node_count + 1]  (name, rule per node)
+//   char     strings[string_bytes]
+void write_snapshot(std::ostream& out, const TreeLayout& layout);
+
+// Read and validate a snapshot written by write_snapshot()
+TreeLayout read_snapshot(std::istream& in);
+
+} // namespace status_rollup
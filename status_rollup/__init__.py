@@ -2,12 +2,21 @@
 
 This package provides tools for building and managing hierarchical status trees
 with configurable rollup rules for aggregating health status from leaf nodes.
+
+``StatusTree.compute()`` is incremental: ``set_status()`` marks the updated node
+dirty, and only its dependents are re-evaluated, stopping at any node whose
+status does not change. Calling ``compute()`` after a handful of updates costs
+time proportional to the affected part of the tree rather than the whole tree.
+When most of a larger tree is dirty, a full pass evaluates independent subtrees
+in parallel instead.
 """
 
 try:
     from ._status_rollup import (
+        ComputeFuture,
         Status,
         StatusTree,
+        TreeLayout,
         __version__,
         status_to_string,
         string_to_status,
@@ -20,15 +29,11 @@ except ImportError as e:
 
 # Export public API
 __all__ = [
+    "ComputeFuture",
     "Status",
     "StatusTree",
+    "TreeLayout",
     "__version__",
     "status_to_string",
     "string_to_status",
 ]
-
-# Add convenience attributes to Status enum
-Status.GREEN = Status.GREEN
-Status.YELLOW = Status.YELLOW
-Status.RED = Status.RED
-Status.UNKNOWN = Status.UNKNOWN
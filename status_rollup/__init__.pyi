@@ -1,6 +1,10 @@
 
 
 from enum import IntEnum
+from typing import Any
+
+# numpy is an optional extra; without it get_statuses_np() is typed as Any
+import numpy as np  # type: ignore[import-not-found, unused-ignore]
 
 __version__: str
 
@@ -11,6 +15,24 @@ class Status(IntEnum):
     RED: int
     UNKNOWN: int
 
+class TreeLayout:
+
+    names: list[str]
+    offsets: list[int]
+    children: list[int]
+    rules: list[str]
+    params: list[list[int]]
+
+class ComputeFuture:
+
+    def done(self) -> bool:
+
+        ...
+
+    def wait(self) -> None:
+
+        ...
+
 class StatusTree:
 
 
@@ -26,18 +48,59 @@ class StatusTree:
 
         ...
 
+    def set_statuses(self, statuses: dict[str, Status]) -> None:
+
+        ...
+
+    def mark_dirty(self, node_name: str) -> None:
+
+        ...
+
     def compute(self) -> None:
 
         ...
 
+    def dirty_count(self) -> int:
+
+        ...
+
+    def compute_async(self) -> ComputeFuture:
+
+        ...
+
     def get_status(self, node_name: str) -> Status | None:
 
         ...
 
+    def get_statuses(self, node_names: list[str]) -> list[Status | None]:
+
+        ...
+
+    def get_statuses_np(self, node_names: list[str]) -> np.ndarray[Any, np.dtype[np.int8]]:
+
+        ...
+
     def print_statuses(self) -> None:
 
         ...
 
+    def layout(self) -> TreeLayout:
+
+        ...
+
+    def save_binary(self, snapshot_file: str) -> None:
+
+        ...
+
+    def load_binary(self, snapshot_file: str) -> None:
+
+        ...
+
+    @staticmethod
+    def from_binary(snapshot_file: str) -> StatusTree:
+
+        ...
+
 def string_to_status(s: str) -> Status:
 
     ...
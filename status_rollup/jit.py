@@ -0,0 +1,148 @@
+"""Numba-compiled rollup for trees that are loaded once and evaluated often.
+
+The kernel walks the nodes of a ``StatusTree`` in topological order over flat
+NumPy arrays, so a full rollup of every node runs as compiled code without
+crossing into the C++ extension per node. This module needs the optional
+``numpy`` and ``numba`` dependencies::
+
+    pip install status-rollup[jit]
+"""
+
+from typing import List, Sequence, Union
+
+try:
+    import numba
+    import numpy as np
+    import numpy.typing as npt
+except ImportError as e:
+    raise ImportError(
+        "status_rollup.jit requires numpy and numba. "
+        "Install them with: pip install status-rollup[jit]"
+    ) from e
+
+from . import Status, StatusTree
+
+__all__ = ["CompiledRollup", "compile_tree"]
+
+# Rule ids used by the kernel; imported (leaf) nodes have an empty rule name
+_LEAF = 0
+_WORST_STATUS = 1
+_THRESHOLD_ROLLUP = 2
+_MAJORITY_VOTE = 3
+
+_RULE_IDS = {
+    "": _LEAF,
+    "worst_status": _WORST_STATUS,
+    "threshold_rollup": _THRESHOLD_ROLLUP,
+    "majority_vote": _MAJORITY_VOTE,
+}
+
+
+@numba.njit(cache=True)  # type: ignore[misc, unused-ignore]
+def _rollup(statuses, offsets, children, rule_ids, params):  # type: ignore[no-untyped-def]
+    # Mirrors the C++ rules in src/rollup_rule.cpp, evaluated from the
+    # histogram of each node's dependency statuses
+    counts = np.zeros(4, dtype=np.int64)
+    for node in range(rule_ids.shape[0]):
+        rule = rule_ids[node]
+        if rule == _LEAF:
+            continue
+
+        counts[:] = 0
+        for j in range(offsets[node], offsets[node + 1]):
+            counts[statuses[children[j]]] += 1
+
+        result = 3
+        if counts.sum() == 0:
+            result = 3
+        elif rule == _WORST_STATUS:
+            result = 0
+            for s in range(1, 4):
+                result = max(result, s * (counts[s] > 0))
+        elif rule == _THRESHOLD_ROLLUP:
+            if counts[2] >= params[node, 0] or counts[1] >= params[node, 2]:
+                result = 2
+            elif counts[1] >= params[node, 1]:
+                result = 1
+            else:
+                result = 0
+        else:
+            result = 0
+            best = 0
+            for s in range(3):
+                if counts[s] > best:
+                    best = counts[s]
+                    result = s
+
+        statuses[node] = result
+
+
+class CompiledRollup:
+    """Rollup kernel bound to the structure of one loaded ``StatusTree``.
+
+    Later structural changes to the tree (e.g. another ``load_config``) are
+    not reflected; compile again in that case.
+    """
+
+    def __init__(self, tree: StatusTree) -> None:
+        layout = tree.layout()
+
+        unsupported = sorted({rule for rule in layout.rules if rule not in _RULE_IDS})
+        if unsupported:
+            raise ValueError(f"Rules not supported by the JIT backend: {', '.join(unsupported)}")
+
+        #: Node names, in the order of the array returned by ``__call__``
+        self.names: List[str] = list(layout.names)
+        #: Leaf node names, in the order ``__call__`` expects their statuses
+        self.leaf_names: List[str] = [
+            name for name, rule in zip(layout.names, layout.rules) if not rule
+        ]
+
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self._leaf_ids = np.array([self._index[name] for name in self.leaf_names], dtype=np.intp)
+        self._offsets = np.array(layout.offsets, dtype=np.int64)
+        self._children = np.array(layout.children, dtype=np.int64)
+        self._rule_ids = np.array([_RULE_IDS[rule] for rule in layout.rules], dtype=np.int8)
+        self._params = np.zeros((len(self.names), 3), dtype=np.int64)
+        for i, params in enumerate(layout.params):
+            self._params[i, : len(params)] = params
+
+    def index(self, node_name: str) -> int:
+        """Return the position of ``node_name`` in the array returned by ``__call__``."""
+        return self._index[node_name]
+
+    def __call__(
+        self, leaf_statuses: Union[Sequence[Status], "npt.NDArray[np.int8]"]
+    ) -> "npt.NDArray[np.int8]":
+        """Compute every node's status from the given leaf statuses.
+
+        Args:
+            leaf_statuses: One status per entry of ``leaf_names``
+
+        Returns:
+            ``np.int8`` array of statuses, ordered like ``names``
+
+        Raises:
+            ValueError: If the number of statuses does not match
+                ``leaf_names`` or a status is outside ``0..3``
+        """
+        leaves = np.asarray(leaf_statuses, dtype=np.int64)
+        if leaves.shape != self._leaf_ids.shape:
+            raise ValueError(
+                f"Expected {len(self._leaf_ids)} leaf statuses, got {leaves.size}"
+            )
+        # The kernel indexes a 4-entry histogram by status without bounds
+        # checks, so anything outside GREEN..UNKNOWN must be rejected here
+        if leaves.size and (leaves.min() < int(Status.GREEN) or leaves.max() > int(Status.UNKNOWN)):
+            raise ValueError("Leaf statuses must be between 0 (GREEN) and 3 (UNKNOWN)")
+        leaves = leaves.astype(np.int8)
+
+        statuses = np.full(len(self.names), int(Status.UNKNOWN), dtype=np.int8)
+        statuses[self._leaf_ids] = leaves
+        _rollup(statuses, self._offsets, self._children, self._rule_ids, self._params)
+        return statuses
+
+
+def compile_tree(tree: StatusTree) -> CompiledRollup:
+    """Compile a rollup kernel for the structure of a loaded ``StatusTree``."""
+    return CompiledRollup(tree)
@@ -1,6 +1,7 @@
 #include "status_rollup/status_tree.hpp"
 #include <gtest/gtest.h>
 #include <fstream>
+#include <iterator>
 #include <nlohmann/json.hpp>
 
 using namespace status_rollup;
@@ -253,3 +254,422 @@ TEST_F(StatusTreeTest, StatusUpdatePropagates) {
     tree.compute();
     EXPECT_EQ(tree.get_status("derived1").value(), Status::Red);
 }
+
+// Test re-publishing an unchanged status queues no work
+TEST_F(StatusTreeTest, RepeatedStatusIsNoOp) {
+    create_simple_config();
+
+    StatusTree tree;
+    tree.load_config(test_config_file_);
+
+    tree.set_status("leaf1", Status::Red);
+    tree.set_status("leaf2", Status::Green);
+    tree.compute();
+    EXPECT_EQ(tree.dirty_count(), 0u);
+
+    tree.set_status("leaf1", Status::Red);
+    tree.set_statuses({{"leaf1", Status::Red}, {"leaf2", Status::Green}});
+    EXPECT_EQ(tree.dirty_count(), 0u);
+
+    // A real change queues the leaf and its dependent; repeating it adds
+    // nothing and does not drop the pending propagation
+    tree.set_status("leaf1", Status::Green);
+    EXPECT_EQ(tree.dirty_count(), 2u);
+    tree.set_status("leaf1", Status::Green);
+    tree.set_statuses({{"leaf1", Status::Green}, {"leaf2", Status::Green}});
+    EXPECT_EQ(tree.dirty_count(), 2u);
+
+    tree.compute();
+    EXPECT_EQ(tree.dirty_count(), 0u);
+    EXPECT_EQ(tree.get_status("derived1").value(), Status::Green);
+}
+
+// Test incremental compute only re-evaluates what changed
+TEST_F(StatusTreeTest, IncrementalComputeAcrossLevels) {
+    json config = {
+        {"nodes", {
+            {"leaf1", {{"type", "imported"}}},
+            {"leaf2", {{"type", "imported"}}},
+            {"leaf3", {{"type", "imported"}}},
+            {"mid", {
+                {"type", "derived"},
+                {"rule", "worst_status"},
+                {"dependencies", {"leaf1", "leaf2"}}
+            }},
+            {"root", {
+                {"type", "derived"},
+                {"rule", "worst_status"},
+                {"dependencies", {"mid", "leaf3"}}
+            }}
+        }}
+    };
+    std::ofstream file(test_config_file_);
+    file << config.dump(2);
+    file.close();
+
+    StatusTree tree;
+    tree.load_config(test_config_file_);
+
+    tree.set_status("leaf1", Status::Green);
+    tree.set_status("leaf2", Status::Green);
+    tree.set_status("leaf3", Status::Green);
+    tree.compute();
+    EXPECT_EQ(tree.get_status("root").value(), Status::Green);
+
+    tree.set_status("leaf2", Status::Red);
+    tree.compute();
+    EXPECT_EQ(tree.get_status("mid").value(), Status::Red);
+    EXPECT_EQ(tree.get_status("root").value(), Status::Red);
+
+    // Compute with nothing dirty leaves everything in place
+    tree.compute();
+    EXPECT_EQ(tree.get_status("root").value(), Status::Red);
+
+    tree.set_status("leaf2", Status::Green);
+    tree.set_status("leaf3", Status::Yellow);
+    tree.compute();
+    EXPECT_EQ(tree.get_status("mid").value(), Status::Green);
+    EXPECT_EQ(tree.get_status("root").value(), Status::Yellow);
+}
+
+// Test the full parallel pass and the incremental pass agree
+TEST_F(StatusTreeTest, FullAndIncrementalComputeAgree) {
+    // 96 leaves -> 12 mid nodes -> 3 upper nodes -> root: 112 nodes, large
+    // enough for compute() to take the full pass when most of it is dirty
+    const char* rules[] = {"worst_status", "threshold_rollup", "majority_vote"};
+    json nodes = json::object();
+    std::vector<std::string> leaves;
+    for (int i = 0; i < 96; ++i) {
+        leaves.push_back("leaf" + std::to_string(i));
+        nodes[leaves.back()] = {{"type", "imported"}};
+    }
+    for (int m = 0; m < 12; ++m) {
+        std::vector<std::string> deps(leaves.begin() + 8 * m, leaves.begin() + 8 * (m + 1));
+        nodes["mid" + std::to_string(m)] = {
+            {"type", "derived"}, {"rule", rules[m % 3]}, {"dependencies", deps}};
+    }
+    for (int u = 0; u < 3; ++u) {
+        std::vector<std::string> deps;
+        for (int m = 4 * u; m < 4 * (u + 1); ++m) {
+            deps.push_back("mid" + std::to_string(m));
+        }
+        nodes["upper" + std::to_string(u)] = {
+            {"type", "derived"}, {"rule", rules[u]}, {"dependencies", deps}};
+    }
+    nodes["root"] = {{"type", "derived"}, {"rule", "worst_status"},
+                     {"dependencies", {"upper0", "upper1", "upper2"}}};
+    std::ofstream file(test_config_file_);
+    file << json{{"nodes", nodes}}.dump(2);
+    file.close();
+
+    const Status cycle[] = {Status::Green, Status::Yellow, Status::Red, Status::Green,
+                            Status::Unknown, Status::Green, Status::Yellow};
+    std::unordered_map<std::string, Status> updates;
+    for (size_t i = 0; i < leaves.size(); ++i) {
+        updates[leaves[i]] = cycle[(i * 5) % 7];
+    }
+
+    // Every node is dirty after load_config(), so this takes the full pass
+    StatusTree full;
+    full.load_config(test_config_file_);
+    full.set_statuses(updates);
+    full.compute();
+
+    // One leaf per compute() dirties only a few nodes: incremental pass
+    StatusTree incremental;
+    incremental.load_config(test_config_file_);
+    incremental.compute();
+    for (const auto& [leaf, status] : updates) {
+        incremental.set_status(leaf, status);
+        incremental.compute();
+    }
+
+    std::vector<std::string> names = full.layout().names;
+    ASSERT_EQ(names.size(), 112u);
+    EXPECT_EQ(incremental.get_statuses(names), full.get_statuses(names));
+}
+
+TEST_F(StatusTreeTest, MarkDirtyRecomputesDerivedNode) {
+    create_simple_config();
+
+    StatusTree tree;
+    tree.load_config(test_config_file_);
+
+    tree.set_status("leaf1", Status::Green);
+    tree.set_status("leaf2", Status::Green);
+    tree.compute();
+
+    // Overriding a derived node is undone once it is re-evaluated
+    tree.set_status("derived1", Status::Red);
+    tree.compute();
+    EXPECT_EQ(tree.get_status("derived1").value(), Status::Green);
+
+    EXPECT_THROW(tree.mark_dirty("nonexistent"), std::runtime_error);
+}
+
+TEST_F(StatusTreeTest, SetStatusesBatch) {
+    create_threshold_config();
+
+    StatusTree tree;
+    tree.load_config(test_config_file_);
+
+    tree.set_statuses({
+        {"service1", Status::Red},
+        {"service2", Status::Red},
+        {"service3", Status::Green}
+    });
+    tree.compute();
+    EXPECT_EQ(tree.get_status("cluster").value(), Status::Red);
+
+    // Unknown names reject the whole batch
+    EXPECT_THROW(tree.set_statuses({{"service1", Status::Green}, {"bogus", Status::Green}}),
+                 std::runtime_error);
+    EXPECT_EQ(tree.get_status("service1").value(), Status::Red);
+}
+
+TEST_F(StatusTreeTest, OutOfRangeStatusRejected) {
+    create_threshold_config();
+
+    StatusTree tree;
+    tree.load_config(test_config_file_);
+    tree.set_statuses({
+        {"service1", Status::Green},
+        {"service2", Status::Green},
+        {"service3", Status::Green}
+    });
+    tree.compute();
+
+    const auto bad = static_cast<Status>(4);
+    EXPECT_THROW(tree.set_status("service1", bad), std::runtime_error);
+    EXPECT_THROW(tree.set_statuses({{"service2", Status::Red}, {"service1", bad}}),
+                 std::runtime_error);
+    tree.compute();
+    EXPECT_EQ(tree.get_status("service1").value(), Status::Green);
+    EXPECT_EQ(tree.get_status("service2").value(), Status::Green);
+    EXPECT_EQ(tree.get_status("cluster").value(), Status::Green);
+}
+
+TEST_F(StatusTreeTest, CircularDependencyRejected) {
+    json config = {
+        {"nodes", {
+            {"leaf1", {{"type", "imported"}}},
+            {"a", {{"type", "derived"}, {"dependencies", {"leaf1", "b"}}}},
+            {"b", {{"type", "derived"}, {"dependencies", {"a"}}}}
+        }}
+    };
+    std::ofstream file(test_config_file_);
+    file << config.dump(2);
+    file.close();
+
+    StatusTree tree;
+    EXPECT_THROW(tree.load_config(test_config_file_), std::runtime_error);
+}
+
+TEST_F(StatusTreeTest, MissingDependencyRejected) {
+    json config = {
+        {"nodes", {
+            {"leaf1", {{"type", "imported"}}},
+            {"derived1", {{"type", "derived"}, {"dependencies", {"leaf1", "missing"}}}}
+        }}
+    };
+    std::ofstream file(test_config_file_);
+    file << config.dump(2);
+    file.close();
+
+    StatusTree tree;
+    EXPECT_THROW(tree.load_config(test_config_file_), std::runtime_error);
+}
+
+// A failed load must leave the tree untouched and usable
+TEST_F(StatusTreeTest, UsableAfterFailedLoad) {
+    json config = {
+        {"nodes", {
+            {"leaf1", {{"type", "imported"}}},
+            {"a", {{"type", "derived"}, {"dependencies", {"leaf1", "b"}}}},
+            {"b", {{"type", "derived"}, {"dependencies", {"a"}}}}
+        }}
+    };
+    std::ofstream file(test_config_file_);
+    file << config.dump(2);
+    file.close();
+
+    StatusTree tree;
+    EXPECT_THROW(tree.load_config(test_config_file_), std::runtime_error);
+    EXPECT_FALSE(tree.get_status("leaf1").has_value());
+    EXPECT_THROW(tree.set_status("leaf1", Status::Red), std::runtime_error);
+
+    // Invalid rule parameters are rejected before any node is created
+    config = {
+        {"nodes", {
+            {"leaf1", {{"type", "imported"}}},
+            {"cluster", {
+                {"type", "derived"},
+                {"rule", "threshold_rollup"},
+                {"params", {{"red_threshold", -1}}},
+                {"dependencies", {"leaf1"}}
+            }}
+        }}
+    };
+    file.open(test_config_file_);
+    file << config.dump(2);
+    file.close();
+    EXPECT_THROW(tree.load_config(test_config_file_), std::runtime_error);
+    EXPECT_FALSE(tree.get_status("leaf1").has_value());
+
+    create_simple_config();
+    tree.load_config(test_config_file_);
+    tree.set_status("leaf1", Status::Red);
+    tree.set_status("leaf2", Status::Green);
+    tree.compute();
+    EXPECT_EQ(tree.get_status("derived1").value(), Status::Red);
+}
+
+TEST_F(StatusTreeTest, LayoutIsTopological) {
+    create_threshold_config();
+
+    StatusTree tree;
+    tree.load_config(test_config_file_);
+    TreeLayout layout = tree.layout();
+
+    ASSERT_EQ(layout.names.size(), 4u);
+    ASSERT_EQ(layout.offsets.size(), 5u);
+    EXPECT_EQ(layout.names.back(), "cluster");
+    EXPECT_EQ(layout.rules.back(), "threshold_rollup");
+    EXPECT_EQ(layout.params.back(), (std::vector<int>{2, 1, 2}));
+    EXPECT_EQ(layout.offsets.back() - layout.offsets[3], 3u);
+    for (size_t i = 0; i < 3; ++i) {
+        EXPECT_TRUE(layout.rules[i].empty());
+        EXPECT_EQ(layout.offsets[i], layout.offsets[i + 1]);
+    }
+}
+
+TEST_F(StatusTreeTest, ComputeAsync) {
+    create_simple_config();
+
+    StatusTree tree;
+    tree.load_config(test_config_file_);
+
+    tree.set_status("leaf1", Status::Yellow);
+    tree.set_status("leaf2", Status::Green);
+    tree.compute_async().get();
+
+    EXPECT_EQ(tree.get_status("derived1").value(), Status::Yellow);
+}
+
+TEST_F(StatusTreeTest, BinarySnapshotRoundTrip) {
+    create_threshold_config();
+    const std::string snapshot_file = "test_snapshot.bin";
+
+    StatusTree original;
+    original.load_config(test_config_file_);
+    original.save_binary(snapshot_file);
+
+    StatusTree tree;
+    tree.load_binary(snapshot_file);
+    std::remove(snapshot_file.c_str());
+
+    TreeLayout expected = original.layout();
+    TreeLayout actual = tree.layout();
+    EXPECT_EQ(actual.names, expected.names);
+    EXPECT_EQ(actual.offsets, expected.offsets);
+    EXPECT_EQ(actual.children, expected.children);
+    EXPECT_EQ(actual.rules, expected.rules);
+    EXPECT_EQ(actual.params, expected.params);
+
+    tree.set_status("service1", Status::Yellow);
+    tree.set_status("service2", Status::Yellow);
+    tree.set_status("service3", Status::Green);
+    tree.compute();
+    EXPECT_EQ(tree.get_status("cluster").value(), Status::Red);
+}
+
+TEST_F(StatusTreeTest, BinarySnapshotRejectsOtherFiles) {
+    create_simple_config();
+
+    StatusTree tree;
+    EXPECT_THROW(tree.load_binary(test_config_file_), std::runtime_error);
+    EXPECT_THROW(tree.load_binary("nonexistent.bin"), std::runtime_error);
+}
+
+// A corrupted rule name must be rejected before any node is created
+TEST_F(StatusTreeTest, BinarySnapshotRejectsUnknownRule) {
+    create_threshold_config();
+    const std::string snapshot_file = "test_snapshot.bin";
+
+    StatusTree original;
+    original.load_config(test_config_file_);
+    original.save_binary(snapshot_file);
+
+    std::string bytes;
+    {
+        std::ifstream in(snapshot_file, std::ios::binary);
+        bytes.assign(std::istreambuf_iterator<char>(in), std::istreambuf_iterator<char>());
+    }
+    size_t pos = bytes.find("threshold_rollup");
+    ASSERT_NE(pos, std::string::npos);
+    bytes[pos] = 'x';
+    {
+        std::ofstream out(snapshot_file, std::ios::binary);
+        out << bytes;
+    }
+
+    StatusTree tree;
+    EXPECT_THROW(tree.load_binary(snapshot_file), std::runtime_error);
+    std::remove(snapshot_file.c_str());
+    EXPECT_FALSE(tree.get_status("service1").has_value());
+    EXPECT_THROW(tree.set_status("service1", Status::Red), std::runtime_error);
+
+    tree.load_config(test_config_file_);
+    tree.set_statuses({{"service1", Status::Red}, {"service2", Status::Red}, {"service3", Status::Green}});
+    tree.compute();
+    EXPECT_EQ(tree.get_status("cluster").value(), Status::Red);
+}
+
+// Names reach Python as str, so malformed UTF-8 must fail validation
+TEST_F(StatusTreeTest, BinarySnapshotRejectsInvalidUtf8) {
+    create_threshold_config();
+    const std::string snapshot_file = "test_snapshot.bin";
+
+    StatusTree original;
+    original.load_config(test_config_file_);
+    original.save_binary(snapshot_file);
+
+    std::string bytes;
+    {
+        std::ifstream in(snapshot_file, std::ios::binary);
+        bytes.assign(std::istreambuf_iterator<char>(in), std::istreambuf_iterator<char>());
+    }
+    size_t pos = bytes.find("service2");
+    ASSERT_NE(pos, std::string::npos);
+    bytes[pos] = '\xff';
+    {
+        std::ofstream out(snapshot_file, std::ios::binary);
+        out << bytes;
+    }
+
+    StatusTree tree;
+    try {
+        tree.load_binary(snapshot_file);
+        ADD_FAILURE() << "load_binary() accepted a name that is not valid UTF-8";
+    } catch (const std::runtime_error& e) {
+        EXPECT_EQ(std::string(e.what()).find('\xff'), std::string::npos);
+    }
+    std::remove(snapshot_file.c_str());
+    EXPECT_FALSE(tree.get_status("service1").has_value());
+}
+
+TEST_F(StatusTreeTest, GetStatusesBatch) {
+    create_simple_config();
+
+    StatusTree tree;
+    tree.load_config(test_config_file_);
+    tree.set_status("leaf1", Status::Red);
+    tree.set_status("leaf2", Status::Green);
+    tree.compute();
+
+    auto statuses = tree.get_statuses({"derived1", "missing", "leaf2"});
+    ASSERT_EQ(statuses.size(), 3u);
+    EXPECT_EQ(statuses[0], Status::Red);
+    EXPECT_FALSE(statuses[1].has_value());
+    EXPECT_EQ(statuses[2], Status::Green);
+}
@@ -62,6 +62,28 @@ class TestStatusConversion:
         assert string_to_status("invalid") == Status.UNKNOWN
 
 
+@pytest.fixture
+def simple_tree(tmp_path):
+    """Tree with a worst_status root over two imported leaves."""
+    config = {
+        "nodes": {
+            "root": {
+                "type": "derived",
+                "rule": "worst_status",
+                "dependencies": ["leaf1", "leaf2"]
+            },
+            "leaf1": {"type": "imported"},
+            "leaf2": {"type": "imported"}
+        }
+    }
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(config))
+
+    tree = StatusTree()
+    tree.load_config(str(config_path))
+    return tree
+
+
 class TestStatusTreeBasic:
     """Test basic StatusTree operations."""
 
@@ -125,6 +147,35 @@ class TestStatusTreeBasic:
         finally:
             Path(config_path).unlink()
 
+    def test_get_statuses(self):
+        """Test querying several statuses in one call."""
+        test_dir = Path(__file__).parent
+        example_config = test_dir.parent / "examples" / "status_config.json"
+
+        tree = StatusTree()
+        tree.load_config(str(example_config))
+        tree.set_status("service_db", Status.RED)
+        tree.set_status("service_api", Status.GREEN)
+
+        statuses = tree.get_statuses(["service_db", "nonexistent", "service_api"])
+        assert statuses == [Status.RED, None, Status.GREEN]
+
+    def test_get_statuses_np(self):
+        """Test querying several statuses into a numpy array."""
+        np = pytest.importorskip("numpy")
+        test_dir = Path(__file__).parent
+        example_config = test_dir.parent / "examples" / "status_config.json"
+
+        tree = StatusTree()
+        tree.load_config(str(example_config))
+        tree.set_status("service_db", Status.RED)
+        tree.set_status("service_api", Status.GREEN)
+
+        statuses = tree.get_statuses_np(["service_db", "nonexistent", "service_api"])
+        assert statuses.dtype == np.int8
+        assert statuses.tolist() == [int(Status.RED), -1, int(Status.GREEN)]
+        assert tree.get_statuses_np([]).shape == (0,)
+
     def test_get_nonexistent_node(self):
         """Test getting status of nonexistent node."""
         tree = StatusTree()
@@ -140,6 +191,114 @@ class TestStatusTreeBasic:
         with pytest.raises(RuntimeError):
             tree.set_status("nonexistent", Status.GREEN)
 
+    def test_mark_dirty_on_nonexistent_node(self):
+        """Test marking a nonexistent node dirty raises error."""
+        tree = StatusTree()
+
+        with pytest.raises(RuntimeError):
+            tree.mark_dirty("nonexistent")
+
+    def test_set_statuses(self, simple_tree):
+        """Test setting several statuses in one call."""
+        simple_tree.set_statuses({"leaf1": Status.GREEN, "leaf2": Status.YELLOW})
+        simple_tree.compute()
+
+        assert simple_tree.get_status("leaf1") == Status.GREEN
+        assert simple_tree.get_status("root") == Status.YELLOW
+
+        # An unknown name rejects the whole batch
+        with pytest.raises(RuntimeError):
+            simple_tree.set_statuses({"leaf1": Status.RED, "nonexistent": Status.RED})
+        assert simple_tree.get_status("leaf1") == Status.GREEN
+
+    def test_out_of_range_status_rejected(self, simple_tree):
+        """Test that statuses beyond UNKNOWN are rejected, not rolled up."""
+        simple_tree.set_statuses({"leaf1": Status.GREEN, "leaf2": Status.GREEN})
+        simple_tree.compute()
+
+        with pytest.raises(RuntimeError):
+            simple_tree.set_status("leaf1", Status(4))
+        with pytest.raises(RuntimeError):
+            simple_tree.set_statuses({"leaf2": Status.RED, "leaf1": Status(4)})
+        simple_tree.compute()
+
+        assert simple_tree.get_status("leaf1") == Status.GREEN
+        assert simple_tree.get_status("leaf2") == Status.GREEN
+        assert simple_tree.get_status("root") == Status.GREEN
+
+    def test_dirty_count(self, simple_tree):
+        """Test that only status changes queue nodes for compute()."""
+        simple_tree.set_statuses({"leaf1": Status.GREEN, "leaf2": Status.GREEN})
+        simple_tree.compute()
+        assert simple_tree.dirty_count() == 0
+
+        simple_tree.set_status("leaf1", Status.GREEN)
+        assert simple_tree.dirty_count() == 0
+
+        simple_tree.set_status("leaf1", Status.RED)
+        assert simple_tree.dirty_count() == 2
+        simple_tree.compute()
+        assert simple_tree.dirty_count() == 0
+
+    def test_compute_async(self, simple_tree):
+        """Test computing on a background thread."""
+        simple_tree.set_statuses({"leaf1": Status.GREEN, "leaf2": Status.RED})
+        future = simple_tree.compute_async()
+        future.wait()
+
+        assert future.done()
+        assert simple_tree.get_status("root") == Status.RED
+
+    def test_layout(self):
+        """Test exporting the tree structure in topological order."""
+        test_dir = Path(__file__).parent
+        example_config = test_dir.parent / "examples" / "status_config.json"
+
+        tree = StatusTree()
+        tree.load_config(str(example_config))
+        layout = tree.layout()
+
+        assert len(layout.offsets) == len(layout.names) + 1
+        assert layout.offsets[-1] == len(layout.children)
+        for i, rule in enumerate(layout.rules):
+            deps = layout.children[layout.offsets[i]:layout.offsets[i + 1]]
+            assert all(dep < i for dep in deps)
+            if not rule:
+                assert deps == []
+
+    def test_binary_snapshot(self, tmp_path):
+        """Test saving a tree to a binary snapshot and loading it back."""
+        test_dir = Path(__file__).parent
+        example_config = test_dir.parent / "examples" / "status_config.json"
+        snapshot_path = str(tmp_path / "config.bin")
+
+        original = StatusTree()
+        original.load_config(str(example_config))
+        original.save_binary(snapshot_path)
+        tree = StatusTree.from_binary(snapshot_path)
+
+        assert tree.layout().names == original.layout().names
+        tree.set_statuses({
+            "service_db": Status.RED,
+            "service_api": Status.RED,
+            "service_cache": Status.GREEN,
+            "service_queue": Status.GREEN,
+        })
+        tree.compute()
+        assert tree.get_status("platform_backend") == Status.RED
+
+    def test_binary_snapshot_rejects_invalid_utf8(self, simple_tree, tmp_path):
+        """Test that a snapshot with a malformed name raises RuntimeError."""
+        snapshot_path = tmp_path / "config.bin"
+        simple_tree.save_binary(str(snapshot_path))
+        data = snapshot_path.read_bytes()
+        snapshot_path.write_bytes(data.replace(b"leaf2", b"\xffeaf2", 1))
+
+        tree = StatusTree()
+        with pytest.raises(RuntimeError):
+            tree.load_binary(str(snapshot_path))
+        assert tree.layout().names == []
+
 
 class TestWorstStatusRule:
     """Test worst_status rollup rule."""
@@ -386,3 +545,35 @@ class TestIntegration:
 
         # Backend should be yellow (1 yellow >= yellow_to_yellow of 1)
         assert tree.get_status("platform_backend") == Status.YELLOW
+
+
+class TestJit:
+    """Test the optional Numba-compiled rollup."""
+
+    def test_matches_compute(self):
+        """Test that the compiled rollup agrees with StatusTree.compute()."""
+        pytest.importorskip("numba")
+        from status_rollup.jit import compile_tree
+
+        test_dir = Path(__file__).parent
+        example_config = test_dir.parent / "examples" / "complex_status_config.json"
+
+        tree = StatusTree()
+        tree.load_config(str(example_config))
+        rollup = compile_tree(tree)
+
+        cycle = [Status.GREEN, Status.RED, Status.YELLOW, Status.GREEN, Status.UNKNOWN]
+        for offset in range(len(cycle)):
+            leaves = [cycle[(i + offset) % len(cycle)] for i in range(len(rollup.leaf_names))]
+            tree.set_statuses(dict(zip(rollup.leaf_names, leaves)))
+            tree.compute()
+
+            statuses = rollup(leaves)
+            for name in rollup.names:
+                assert statuses[rollup.index(name)] == int(tree.get_status(name))
+
+        with pytest.raises(ValueError):
+            rollup([Status.GREEN])
+        for bad in (-1, 4, 100):
+            with pytest.raises(ValueError):
+                rollup([bad] * len(rollup.leaf_names))
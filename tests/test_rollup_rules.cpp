@@ -1,9 +1,12 @@
 #include "status_rollup/status.hpp"
 #include "../src/rollup_rule.hpp"
 #include <gtest/gtest.h>
+#include <nlohmann/json.hpp>
+#include <stdexcept>
 #include <vector>
 
 using namespace status_rollup;
+using json = nlohmann::json;
 
 // Test WorstStatusRule
 TEST(WorstStatusRuleTest, AllGreen) {
@@ -61,6 +64,25 @@ TEST(ThresholdRollupRuleTest, AllGreen) {
     EXPECT_EQ(rule.compute(inputs), Status::Green);
 }
 
+TEST(ThresholdRollupRuleTest, LargeMixedInput) {
+    ThresholdRollupRule rule(3, 40, 80);
+    std::vector<Status> inputs(100, Status::Green);
+    for (size_t i = 0; i < 40; ++i) inputs[i * 2] = Status::Yellow;
+    inputs[1] = Status::Red;
+    inputs[3] = Status::Unknown;
+    EXPECT_EQ(rule.compute(inputs), Status::Yellow);
+
+    inputs[5] = Status::Red;
+    inputs[7] = Status::Red;
+    EXPECT_EQ(rule.compute(inputs), Status::Red);
+}
+
+TEST(ThresholdRollupRuleTest, RejectsOutOfRangeThresholds) {
+    EXPECT_THROW(ThresholdRollupRule(-1, 1, 2), std::runtime_error);
+    EXPECT_THROW(ThresholdRollupRule(1, 70000, 2), std::runtime_error);
+    EXPECT_NO_THROW(ThresholdRollupRule(0, 65535, 2));
+}
+
 // Test MajorityVoteRule
 TEST(MajorityVoteRuleTest, GreenMajority) {
     MajorityVoteRule rule;
@@ -94,6 +116,51 @@ TEST(MajorityVoteRuleTest, WithUnknown) {
     EXPECT_EQ(rule.compute(inputs), Status::Green);
 }
 
+// Test histogram-based evaluation
+TEST(StatusCountsTest, CountStatuses) {
+    std::vector<Status> inputs = {Status::Red, Status::Green, Status::Red, Status::Unknown};
+    StatusCounts counts = count_statuses(inputs);
+    EXPECT_EQ(counts[static_cast<size_t>(Status::Green)], 1u);
+    EXPECT_EQ(counts[static_cast<size_t>(Status::Yellow)], 0u);
+    EXPECT_EQ(counts[static_cast<size_t>(Status::Red)], 2u);
+    EXPECT_EQ(counts[static_cast<size_t>(Status::Unknown)], 1u);
+}
+
+TEST(StatusCountsTest, LargeInputDoesNotOverflowLanes) {
+    std::vector<Status> inputs(200000, Status::Yellow);
+    inputs[0] = Status::Red;
+    inputs[1] = Status::Unknown;
+    StatusCounts counts = count_statuses(inputs);
+    EXPECT_EQ(counts[static_cast<size_t>(Status::Green)], 0u);
+    EXPECT_EQ(counts[static_cast<size_t>(Status::Yellow)], 199998u);
+    EXPECT_EQ(counts[static_cast<size_t>(Status::Red)], 1u);
+    EXPECT_EQ(counts[static_cast<size_t>(Status::Unknown)], 1u);
+}
+
+TEST(StatusCountsTest, OrderIndependent) {
+    ThresholdRollupRule rule(2, 1, 3);
+    std::vector<Status> a = {Status::Red, Status::Green, Status::Red};
+    std::vector<Status> b = {Status::Green, Status::Red, Status::Red};
+    EXPECT_EQ(count_statuses(a), count_statuses(b));
+    EXPECT_EQ(rule.evaluate(count_statuses(a)), rule.compute(b));
+}
+
+// Test RuleFactory
+TEST(RuleFactoryTest, CreatesKnownRules) {
+    json params = {{"red_threshold", 2}, {"yellow_to_yellow", 1}, {"yellow_to_red", 3}};
+    EXPECT_EQ(RuleFactory::create("worst_status", json::object())->name(), "worst_status");
+    EXPECT_EQ(RuleFactory::create("majority_vote", json::object())->name(), "majority_vote");
+
+    auto rule = RuleFactory::create("threshold_rollup", params);
+    EXPECT_EQ(rule->name(), "threshold_rollup");
+    std::vector<Status> inputs = {Status::Red, Status::Green, Status::Green};
+    EXPECT_EQ(rule->compute(inputs), Status::Green);
+}
+
+TEST(RuleFactoryTest, UnknownRuleThrows) {
+    EXPECT_THROW(RuleFactory::create("no_such_rule", json::object()), std::runtime_error);
+}
+
 // Test Status conversion functions
 TEST(StatusConversionTest, StringToStatus) {
     EXPECT_EQ(string_to_status("green"), Status::Green);